@@ -1,16 +1,21 @@
 import os
-import tempfile
+import threading
 import time
+from collections import defaultdict, deque
+from typing import Deque, Dict
 from uuid import uuid4
 
-from flask import Flask, render_template, request, abort, url_for, send_from_directory
-from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from qr_utils import create_qr_code
-from s3_utils import generate_presigned_url, upload_to_s3, delete_from_s3
 
+# Load .env before importing modules that read AWS settings at import time
 load_dotenv()
 
+from flask import Flask, render_template, request, abort
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.utils import secure_filename
+from qr_utils import create_qr_data_uri
+from s3_utils import generate_presigned_url, upload_stream_to_s3, delete_from_s3, warm_s3_client
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', os.urandom(16))
 app.config['MAX_CONTENT_LENGTH'] = 2 * 1024 * 1024 * 1024  # 2GB
@@ -22,32 +27,97 @@ DELETE_TOKEN = os.getenv('DELETE_TOKEN', '')
 
 PUBLIC_URL = os.getenv('PUBLIC_URL', 'http://localhost:5000')
 
-# ----------------------------
-# Railway Writable Directories
-# ----------------------------
-RAILWAY_TMP_DIR = "/mnt/data/tmp"
-RAILWAY_QR_DIR = "/mnt/data/qr"
+REDIS_URL = os.getenv('REDIS_URL')
+REDIS_TIMEOUT_SECONDS = float(os.getenv('REDIS_TIMEOUT_SECONDS', '0.25'))
 
-os.makedirs(RAILWAY_TMP_DIR, exist_ok=True)
-os.makedirs(RAILWAY_QR_DIR, exist_ok=True)
+# Number of reverse proxies (e.g. 1 on Railway) whose X-Forwarded-For to trust,
+# so rate limiting sees the client address rather than the proxy's
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT)
 
-# Simple in-memory rate limit for /decrypt
+# Rolling-window rate limit for the decrypt page and /delete (token guessing).
+# With REDIS_URL set the window is a sorted set shared by every worker;
+# otherwise it is tracked per process.
 REQUEST_WINDOW_SECONDS = 60
 MAX_REQUESTS_PER_WINDOW = 30
-_request_log = {}
+_request_log: Dict[str, Deque[float]] = defaultdict(deque)
+_request_log_lock = threading.Lock()
+_request_log_calls = 0
+# Drop IPs with no requests left in the window every N calls
+REQUEST_LOG_SWEEP_INTERVAL = 1000
+
+# KEYS[1]=per-IP key; ARGV: now, window, limit, unique member
+_RATE_LIMIT_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. (now - window))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 1
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], math.ceil(window))
+return 0
+"""
+
+_rate_limit_script = None
+if REDIS_URL:
+    import redis
+
+    # Short timeouts so an unreachable Redis degrades to the in-memory window
+    # quickly instead of blocking each request for the OS connect timeout
+    _rate_limit_client = redis.Redis.from_url(
+        REDIS_URL,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+    )
+    _rate_limit_script = _rate_limit_client.register_script(_RATE_LIMIT_LUA)
 
 
 def _rate_limited(ip: str) -> bool:
     now = time.time()
+    if _rate_limit_script is not None:
+        try:
+            # One EVALSHA round trip; atomic across workers
+            return bool(_rate_limit_script(
+                keys=[f"rl:{ip}"],
+                args=[now, REQUEST_WINDOW_SECONDS, MAX_REQUESTS_PER_WINDOW, uuid4().hex],
+            ))
+        except redis.RedisError:
+            pass  # fall back to the per-process window below
+
+    global _request_log_calls
     window_start = now - REQUEST_WINDOW_SECONDS
-    reqs = _request_log.get(ip, [])
-    reqs = [t for t in reqs if t >= window_start]
-    if len(reqs) >= MAX_REQUESTS_PER_WINDOW:
-        _request_log[ip] = reqs
-        return True
-    reqs.append(now)
-    _request_log[ip] = reqs
-    return False
+    with _request_log_lock:
+        _request_log_calls += 1
+        if _request_log_calls % REQUEST_LOG_SWEEP_INTERVAL == 0:
+            _sweep_request_log(window_start)
+
+        # Timestamps are appended in order, so expired ones sit at the left
+        dq = _request_log[ip]
+        while dq and dq[0] < window_start:
+            dq.popleft()
+        if len(dq) >= MAX_REQUESTS_PER_WINDOW:
+            return True
+        dq.append(now)
+        return False
+
+
+def _sweep_request_log(window_start: float) -> None:
+    """Forget IPs whose requests have all aged out. Caller holds the lock."""
+    idle = [ip for ip, dq in _request_log.items() if not dq or dq[-1] < window_start]
+    for ip in idle:
+        del _request_log[ip]
+
+
+# Endpoints subject to the per-IP limit above
+RATE_LIMITED_ENDPOINTS = {"fake_decrypt", "delete"}
+
+
+@app.before_request
+def _enforce_rate_limit():
+    if request.endpoint in RATE_LIMITED_ENDPOINTS and _rate_limited(request.remote_addr or ""):
+        abort(429, description="Too many requests")
 
 
 @app.get("/health")
@@ -60,10 +130,37 @@ def index():
     return render_template("index.html", default_expiry=DEFAULT_EXPIRY)
 
 
-@app.get("/qr/<path:filename>")
-def serve_qr(filename):
-    """Serve QR images stored in /mnt/data/qr"""
-    return send_from_directory(RAILWAY_QR_DIR, filename)
+def _store_upload(stream, original_filename: str, content_type: str, expiry: int):
+    """Stream an upload body to S3 and presign a download link for it.
+
+    Returns:
+        tuple: (object_key, presigned_url)
+    """
+    uuid_part = uuid4().hex
+    object_key = f"uploads/{uuid_part}/{original_filename}"
+
+    # Stream the upload body straight to S3; no local staging copy
+    upload_stream_to_s3(
+        stream,
+        AWS_BUCKET,
+        object_key,
+        {
+            "ServerSideEncryption": "AES256",
+            "ContentType": content_type or "application/octet-stream",
+        },
+    )
+
+    disposition = f"attachment; filename=\"{original_filename}\""
+    presigned_url = generate_presigned_url(
+        bucket=AWS_BUCKET,
+        object_key=object_key,
+        expiry=expiry,
+        response_headers={
+            "ResponseContentDisposition": disposition,
+            "ResponseContentType": "application/octet-stream",
+        },
+    )
+    return object_key, presigned_url
 
 
 @app.post("/upload")
@@ -81,71 +178,50 @@ def upload():
     if not original_filename:
         abort(400, description="Invalid filename")
 
-    suffix = os.path.splitext(original_filename)[1] or ''
+    object_key, download_link = _store_upload(file.stream, original_filename, file.mimetype, expiry)
 
-    # Use Railway writable tmp directory
-    plaintext_tmp_fd, plaintext_tmp_path = tempfile.mkstemp(
-        dir=RAILWAY_TMP_DIR, suffix=suffix
+    # Inline SVG QR; nothing is written to disk or served separately
+    qr_data_uri = create_qr_data_uri(download_link)
+
+    return render_template(
+        "result.html",
+        qr_image_url=qr_data_uri,
+        expiry_seconds=expiry,
+        decrypt_link=download_link,
+        bucket=AWS_BUCKET,
+        object_key=object_key,
+        filename=original_filename,
     )
-    os.close(plaintext_tmp_fd)
 
-    try:
-        with file.stream as in_stream, open(plaintext_tmp_path, 'wb') as out:
-            while True:
-                chunk = in_stream.read(4 * 1024 * 1024)
-                if not chunk:
-                    break
-                out.write(chunk)
-
-        uuid_part = uuid4().hex
-        object_key = f"uploads/{uuid_part}/{original_filename}"
-
-        upload_to_s3(
-            file_path=plaintext_tmp_path,
-            bucket=AWS_BUCKET,
-            object_key=object_key,
-            key_prefix="",
-            extra_args={
-                "ServerSideEncryption": "AES256",
-            },
-        )
-
-        disposition = f"attachment; filename=\"{original_filename}\""
-        presigned_url = generate_presigned_url(
-            bucket=AWS_BUCKET,
-            object_key=object_key,
-            expiry=expiry,
-            response_headers={
-                "ResponseContentDisposition": disposition,
-                "ResponseContentType": "application/octet-stream",
-            },
-        )
-
-        download_link = presigned_url
-
-        # Save QR into Railway writable folder
-        qr_filename = f"{uuid_part}.png"
-        qr_path = os.path.join(RAILWAY_QR_DIR, qr_filename)
-        create_qr_code(download_link, output_path=qr_path)
-
-        # Serve QR via `/qr/...`
-        qr_url = url_for("serve_qr", filename=qr_filename)
-
-        return render_template(
-            "result.html",
-            qr_image_url=qr_url,
-            expiry_seconds=expiry,
-            decrypt_link=download_link,
-            bucket=AWS_BUCKET,
-            object_key=object_key,
-            filename=original_filename,
-        )
-
-    finally:
-        try:
-            os.remove(plaintext_tmp_path)
-        except OSError:
-            pass
+
+@app.put("/upload/<path:filename>")
+def upload_raw(filename):
+    """Upload the raw request body as ``filename``.
+
+    The body is never run through the multipart form parser, so it is not
+    spooled to a temporary file first; prefer this for large files.
+    """
+    expiry = request.args.get('expiry', type=int) or DEFAULT_EXPIRY
+    expiry = max(60, min(604800, expiry))
+
+    chunked = "chunked" in request.headers.get("Transfer-Encoding", "").lower()
+    if request.content_length == 0 or (request.content_length is None and not chunked):
+        abort(400, description="Missing file")
+    if not AWS_BUCKET:
+        abort(500, description="Server not configured (AWS_BUCKET)")
+
+    original_filename = secure_filename(filename)
+    if not original_filename:
+        abort(400, description="Invalid filename")
+
+    object_key, download_link = _store_upload(request.stream, original_filename, request.mimetype, expiry)
+
+    return {
+        "bucket": AWS_BUCKET,
+        "key": object_key,
+        "url": download_link,
+        "expires_in": expiry,
+    }
 
 
 @app.get("/fake-decrypt")
@@ -160,8 +236,10 @@ def fake_decrypt():
 @app.post("/delete")
 def delete():
     token = request.form.get('token') or request.headers.get('X-Delete-Token')
-    bucket = request.form.get('bucket') or (request.json.get('bucket') if request.is_json else None)
-    object_key = request.form.get('key') or (request.json.get('key') if request.is_json else None)
+    # Parse a JSON body at most once; malformed JSON reads as empty
+    data = request.get_json(silent=True) or {}
+    bucket = request.form.get('bucket') or data.get('bucket')
+    object_key = request.form.get('key') or data.get('key')
 
     if not token or token != DELETE_TOKEN:
         abort(401, description="Unauthorized")
@@ -175,7 +253,48 @@ def delete():
         abort(400, description=str(e))
 
 
+def create_app() -> Flask:
+    """Run one-time startup work and return the application.
+
+    Importing this module does no network I/O; servers should build the app
+    through this factory (e.g. ``gunicorn "app:create_app()"``) so each worker
+    warms its own S3 connection pool after forking.
+    """
+    app.debug = os.getenv('FLASK_DEBUG') == '1'
+    if AWS_BUCKET:
+        warm_s3_client(AWS_BUCKET)
+    return app
+
+
+def get_server_port() -> int:
+    """Port run_server binds to ($PORT, default 5000)."""
+    return int(os.getenv('PORT', 5000))
+
+
+def run_server(flask_app: Flask) -> None:
+    """Serve flask_app on $PORT with waitress; FLASK_DEBUG=1 uses the dev server."""
+    port = get_server_port()
+    if flask_app.debug:
+        flask_app.run(host='0.0.0.0', port=port, debug=True)
+        return
+
+    from waitress import serve
+
+    # Workers mostly wait on S3, so threads scale well past the core count
+    threads = min(32, max(8, (os.cpu_count() or 2) * 4))
+    # waitress caps bodies at 1 GiB by default; honour MAX_CONTENT_LENGTH instead.
+    # Note waitress buffers bodies over 512 KB to a temp file before calling
+    # the app, so for large uploads deploy behind gunicorn (see README).
+    serve(
+        flask_app,
+        host='0.0.0.0',
+        port=port,
+        threads=threads,
+        connection_limit=1000,
+        max_request_body_size=flask_app.config['MAX_CONTENT_LENGTH'],
+    )
+
+
 if __name__ == '__main__':
-    app.debug = True
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    run_server(create_app())
 
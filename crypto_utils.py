@@ -1,6 +1,9 @@
 import base64
+import mmap
 import os
+import struct
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -13,6 +16,18 @@ from cryptography.hazmat.backends import default_backend
 MAGIC = b"SFT1"
 NONCE_SIZE = 12
 KEY_SIZE = 32  # 256-bit AES
+TAG_SIZE = 16
+CHUNK_SIZE = 4 * 1024 * 1024  # streaming read size
+
+# Chunked container for encrypt_file_parallel; every chunk is sealed on its own:
+# [ MAGIC_CHUNKED(4) | BASE_NONCE(8) | CHUNK_SIZE(u32 BE) | (CIPHERTEXT_i | TAG_i)* ]
+# Chunk i uses nonce BASE_NONCE || u32 BE(i) and AAD header || final-flag, so
+# chunks cannot be reordered, dropped or appended without failing verification.
+MAGIC_CHUNKED = b"SFT2"
+BASE_NONCE_SIZE = 8
+CHUNKED_HEADER_SIZE = len(MAGIC_CHUNKED) + BASE_NONCE_SIZE + 4
+MIN_PARALLEL_CHUNK = 8 * 1024 * 1024
+MAX_PARALLEL_CHUNK = 64 * 1024 * 1024  # bounds per-worker memory
 
 
 
@@ -47,20 +62,22 @@ def encrypt_file(file_path: str) -> Tuple[str, str]:
 	Returns:
 		Tuple[str, str]: (encrypted_file_path, key_base64)
 	"""
-	with open(file_path, "rb") as f:
-		plaintext = f.read()
-
 	key = generate_aes256_key()
 	nonce = os.urandom(NONCE_SIZE)
-	aesgcm = AESGCM(key)
-	ciphertext = aesgcm.encrypt(nonce, plaintext, None)
+	encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=default_backend()).encryptor()
 
-	fd, temp_path = tempfile.mkstemp(suffix=".enc")
-	os.close(fd)
-	with open(temp_path, "wb") as out:
-		out.write(MAGIC)
-		out.write(nonce)
-		out.write(ciphertext)
+	with open(file_path, "rb") as f:
+		fd, temp_path = tempfile.mkstemp(suffix=".enc")
+		try:
+			with os.fdopen(fd, "wb") as out:
+				out.write(MAGIC)
+				out.write(nonce)
+				_encrypt_chunks(f, out, encryptor)
+				encryptor.finalize()
+				out.write(encryptor.tag)
+		except BaseException:
+			_remove_quietly(temp_path)
+			raise
 
 	return temp_path, encode_key_base64(key)
 
@@ -68,6 +85,9 @@ def encrypt_file(file_path: str) -> Tuple[str, str]:
 def decrypt_file(encrypted_file_path: str, key_base64: str, output_path: Optional[str] = None) -> str:
 	"""Decrypt a file produced by encrypt_file using the provided Base64 key.
 
+	Files written by encrypt_file_parallel are recognised by their header and
+	decrypted chunk-wise in parallel.
+
 	Args:
 		encrypted_file_path: Path to the encrypted file (MAGIC+NONCE+CIPHERTEXT).
 		key_base64: Base64-encoded AES-256 key string.
@@ -76,16 +96,7 @@ def decrypt_file(encrypted_file_path: str, key_base64: str, output_path: Optiona
 	Returns:
 		str: Path to the decrypted plaintext file.
 	"""
-	with open(encrypted_file_path, "rb") as f:
-		header = f.read(len(MAGIC))
-		if header != MAGIC:
-			raise ValueError("Invalid encrypted file format: MAGIC mismatch")
-		nonce = f.read(NONCE_SIZE)
-		ciphertext = f.read()
-
 	key = decode_key_base64(key_base64)
-	aesgcm = AESGCM(key)
-	plaintext = aesgcm.decrypt(nonce, ciphertext, None)
 
 	if output_path is None:
 		if encrypted_file_path.endswith(".enc"):
@@ -93,13 +104,203 @@ def decrypt_file(encrypted_file_path: str, key_base64: str, output_path: Optiona
 		else:
 			output_path = encrypted_file_path + ".decrypted"
 
-	with open(output_path, "wb") as out:
-		out.write(plaintext)
+	with open(encrypted_file_path, "rb") as f:
+		header = f.read(len(MAGIC))
+		if header == MAGIC_CHUNKED:
+			_write_verified(output_path, lambda out: _decrypt_chunked(f, key, out))
+			return output_path
+		if header != MAGIC:
+			raise ValueError("Invalid encrypted file format: MAGIC mismatch")
+		nonce = f.read(NONCE_SIZE)
+		ciphertext_len = os.fstat(f.fileno()).st_size - len(MAGIC) - NONCE_SIZE - TAG_SIZE
+		if len(nonce) != NONCE_SIZE or ciphertext_len < 0:
+			raise ValueError("Invalid encrypted file format: truncated")
+		f.seek(-TAG_SIZE, os.SEEK_END)
+		tag = f.read(TAG_SIZE)
+		f.seek(len(MAGIC) + NONCE_SIZE)
+
+		decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+
+		def write(out) -> None:
+			_decrypt_chunks(f, out, decryptor, ciphertext_len)
+			decryptor.finalize()
+
+		_write_verified(output_path, write)
 
 	return output_path
 
 
-def encrypt_stream_to_file(file_like, output_path: str) -> Tuple[str, str]:
+def _write_verified(output_path: str, write) -> None:
+	"""Run write(out) against a temp file beside output_path, then move it into place.
+
+	Plaintext is only trustworthy once the tag verifies, so nothing appears at
+	output_path (and an existing file there is left untouched) unless write
+	returns without raising.
+	"""
+	fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", suffix=".part")
+	try:
+		with os.fdopen(fd, "w+b") as out:
+			write(out)
+		os.replace(temp_path, output_path)
+	except BaseException:
+		_remove_quietly(temp_path)
+		raise
+
+
+def _remove_quietly(path: str) -> None:
+	"""Delete path, ignoring errors (it may never have been created)."""
+	try:
+		os.remove(path)
+	except OSError:
+		pass
+
+
+def _encrypt_chunks(file_like, out, encryptor, hasher=None) -> int:
+	"""Feed file_like through encryptor into out, reusing fixed buffers.
+
+	Reads land in one preallocated buffer and ciphertext in another via
+	update_into, so no per-chunk bytes objects are allocated. If hasher is
+	given it is updated with each ciphertext chunk as it is written.
+
+	Returns:
+		int: Number of ciphertext bytes written.
+	"""
+	total = 0
+	in_buf = bytearray(CHUNK_SIZE)
+	# update_into needs room for up to one extra block
+	out_buf = bytearray(CHUNK_SIZE + 15)
+	in_view = memoryview(in_buf)
+	out_view = memoryview(out_buf)
+	readinto = getattr(file_like, "readinto", None)
+	while True:
+		if readinto is not None:
+			n = readinto(in_buf)
+			chunk = in_view[:n] if n else None
+		else:
+			chunk = file_like.read(CHUNK_SIZE)
+		if not chunk:
+			break
+		written = encryptor.update_into(chunk, out_buf)
+		out.write(out_view[:written])
+		if hasher is not None:
+			hasher.update(out_view[:written])
+		total += written
+	return total
+
+
+def encrypt_file_parallel(file_path: str, workers: Optional[int] = None) -> Tuple[str, str]:
+	"""Encrypt a file as independently sealed AES-256-GCM chunks across threads.
+
+	A single GCM stream is inherently serial; splitting the file into chunks
+	with distinct nonces lets each core encrypt its own slice. Input and output
+	are memory-mapped so chunks are read and written in place. The result uses
+	the MAGIC_CHUNKED container and is read back by decrypt_file.
+
+	Args:
+		file_path: Path to the plaintext file to encrypt.
+		workers: Thread count; defaults to the number of CPUs.
+
+	Returns:
+		Tuple[str, str]: (encrypted_file_path, key_base64)
+	"""
+	workers = workers or os.cpu_count() or 1
+	size = os.path.getsize(file_path)
+	chunk_size = min(MAX_PARALLEL_CHUNK, max(MIN_PARALLEL_CHUNK, -(-size // workers)))
+	n_chunks = max(1, -(-size // chunk_size))
+
+	key = generate_aes256_key()
+	aesgcm = AESGCM(key)
+	base_nonce = os.urandom(BASE_NONCE_SIZE)
+	header = MAGIC_CHUNKED + base_nonce + struct.pack(">I", chunk_size)
+
+	with open(file_path, "rb") as f:
+		fd, temp_path = tempfile.mkstemp(suffix=".enc")
+		try:
+			with os.fdopen(fd, "w+b") as out:
+				out.truncate(CHUNKED_HEADER_SIZE + size + n_chunks * TAG_SIZE)
+				with _map_readonly(f, size) as src, mmap.mmap(out.fileno(), 0) as dst:
+					dst[:CHUNKED_HEADER_SIZE] = header
+
+					def seal(i: int) -> None:
+						start = i * chunk_size
+						end = min(start + chunk_size, size)
+						final = i == n_chunks - 1
+						nonce = base_nonce + struct.pack(">I", i)
+						ct = aesgcm.encrypt(nonce, src[start:end], header + (b"\x01" if final else b"\x00"))
+						offset = CHUNKED_HEADER_SIZE + start + i * TAG_SIZE
+						dst[offset:offset + len(ct)] = ct
+
+					with ThreadPoolExecutor(workers) as ex:
+						list(ex.map(seal, range(n_chunks)))
+		except BaseException:
+			_remove_quietly(temp_path)
+			raise
+
+	return temp_path, encode_key_base64(key)
+
+
+def _decrypt_chunked(f, key: bytes, out) -> None:
+	"""Decrypt a MAGIC_CHUNKED container (positioned after MAGIC) into out in parallel."""
+	rest = f.read(CHUNKED_HEADER_SIZE - len(MAGIC_CHUNKED))
+	if len(rest) != CHUNKED_HEADER_SIZE - len(MAGIC_CHUNKED):
+		raise ValueError("Invalid encrypted file format: truncated")
+	header = MAGIC_CHUNKED + rest
+	base_nonce = rest[:BASE_NONCE_SIZE]
+	(chunk_size,) = struct.unpack(">I", rest[BASE_NONCE_SIZE:])
+
+	body_len = os.fstat(f.fileno()).st_size - CHUNKED_HEADER_SIZE
+	record_size = chunk_size + TAG_SIZE
+	n_chunks = -(-body_len // record_size)
+	if chunk_size == 0 or n_chunks == 0 or body_len - (n_chunks - 1) * record_size < TAG_SIZE:
+		raise ValueError("Invalid encrypted file format: truncated")
+	size = body_len - n_chunks * TAG_SIZE
+	aesgcm = AESGCM(key)
+
+	out.truncate(size)
+	with _map_readonly(f, CHUNKED_HEADER_SIZE + body_len) as src, _map_writable(out, size) as dst:
+
+		def open_chunk(i: int) -> None:
+			start = CHUNKED_HEADER_SIZE + i * record_size
+			end = min(start + record_size, CHUNKED_HEADER_SIZE + body_len)
+			final = i == n_chunks - 1
+			nonce = base_nonce + struct.pack(">I", i)
+			pt = aesgcm.decrypt(nonce, src[start:end], header + (b"\x01" if final else b"\x00"))
+			dst[i * chunk_size:i * chunk_size + len(pt)] = pt
+
+		with ThreadPoolExecutor(os.cpu_count() or 1) as ex:
+			list(ex.map(open_chunk, range(n_chunks)))
+
+
+def _map_readonly(f, size: int):
+	"""Read-only mmap of f, or an empty buffer when there is nothing to map."""
+	if size == 0:
+		return memoryview(b"")
+	return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_writable(f, size: int):
+	"""Writable mmap of f (already sized), or an empty buffer for size 0."""
+	if size == 0:
+		return memoryview(bytearray())
+	return mmap.mmap(f.fileno(), 0)
+
+
+def _decrypt_chunks(f, out, decryptor, length: int) -> None:
+	"""Feed the next length bytes of f through decryptor into out."""
+	in_buf = bytearray(CHUNK_SIZE)
+	out_buf = bytearray(CHUNK_SIZE + 15)
+	in_view = memoryview(in_buf)
+	out_view = memoryview(out_buf)
+	while length > 0:
+		n = f.readinto(in_view[:min(CHUNK_SIZE, length)])
+		if not n:
+			raise ValueError("Invalid encrypted file format: truncated")
+		length -= n
+		written = decryptor.update_into(in_view[:n], out_buf)
+		out.write(out_view[:written])
+
+
+def encrypt_stream_to_file(file_like, output_path: str, hasher=None) -> Tuple[str, str]:
 	"""Encrypt a file-like object using streaming AES-256-GCM and write to output_path.
 
 	Format: [12-byte nonce][ciphertext bytes][16-byte tag]
@@ -107,27 +308,47 @@ def encrypt_stream_to_file(file_like, output_path: str) -> Tuple[str, str]:
 	Args:
 		file_like: A binary file-like object open for reading.
 		output_path: Destination path to write the encrypted blob.
+		hasher: Optional hashlib object fed every byte written, so the blob
+			can be fingerprinted without reading it back.
 
 	Returns:
 		Tuple[str, str]: (output_path, base64_key)
 	"""
+	with open(output_path, "wb") as out:
+		_, key_b64 = encrypt_stream_to_sink(file_like, out, hasher)
+
+	return output_path, key_b64
+
+
+def encrypt_stream_to_sink(file_like, sink, hasher=None) -> Tuple[int, str]:
+	"""Encrypt a file-like object with streaming AES-256-GCM into a writable sink.
+
+	Same format as encrypt_stream_to_file, but the destination is any binary
+	object with write() (an open file, io.BytesIO, a socket wrapper...).
+
+	Args:
+		file_like: A binary file-like object open for reading.
+		sink: A binary file-like object open for writing.
+		hasher: Optional hashlib object fed every byte written to sink.
+
+	Returns:
+		Tuple[int, str]: (bytes_written, base64_key)
+	"""
 	key = generate_aes256_key()
 	nonce = os.urandom(NONCE_SIZE)
 	cipher = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=default_backend())
 	encryptor = cipher.encryptor()
 
-	with open(output_path, "wb") as out:
-		out.write(nonce)  # no MAGIC for web flow; exact format per spec
-		while True:
-			chunk = file_like.read(4 * 1024 * 1024)
-			if not chunk:
-				break
-			ct = encryptor.update(chunk)
-			if ct:
-				out.write(ct)
-		encryptor.finalize()
-		out.write(encryptor.tag)
-
-	return output_path, encode_key_base64(key)
+	sink.write(nonce)  # no MAGIC for web flow; exact format per spec
+	if hasher is not None:
+		hasher.update(nonce)
+	written = _encrypt_chunks(file_like, sink, encryptor, hasher)
+	encryptor.finalize()
+	sink.write(encryptor.tag)
+	if hasher is not None:
+		hasher.update(encryptor.tag)
+
+	return NONCE_SIZE + written + TAG_SIZE, encode_key_base64(key)
+
 
 
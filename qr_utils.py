@@ -1,32 +1,57 @@
-from typing import Optional
+import os
+from typing import BinaryIO, Optional, Union
 
-import qrcode
-from qrcode.constants import ERROR_CORRECT_M
+import segno
 
+# Image formats segno writes natively; raster formats such as .jpg are not supported
+QR_FILE_EXTENSIONS = (".png", ".svg", ".svgz", ".pdf", ".eps")
 
-def create_qr_code(url: str, output_path: str = "qr.png", box_size: int = 10, border: int = 4) -> str:
+
+def _make_qr(url: str) -> segno.QRCode:
+	"""Encode the URL with the error-correction level shared by every output."""
+	return segno.make(url, error="m")
+
+
+def create_qr_code(
+	url: str,
+	output_path: Union[str, os.PathLike, BinaryIO] = "qr.png",
+	box_size: int = 10,
+	border: int = 4,
+) -> Union[str, os.PathLike, BinaryIO]:
 	"""Generate and save a QR code image containing the provided URL.
 
 	Args:
 		url: The URL to encode in the QR.
-		output_path: Where to save the generated QR image.
+		output_path: Where to save the generated QR image. A path's extension
+			picks the format; a binary file-like object receives a PNG.
 		box_size: Pixel size of each QR module.
 		border: Border width (modules).
 
 	Returns:
-		str: The path to the generated QR image.
+		The path (or file-like object) the QR image was written to.
 	"""
-	qr = qrcode.QRCode(
-		version=None,
-		error_correction=ERROR_CORRECT_M,
-		box_size=box_size,
-		border=border,
-	)
-	qr.add_data(url)
-	qr.make(fit=True)
-	img = qr.make_image(fill_color="black", back_color="white")
-	img.save(output_path)
+	qr = _make_qr(url)
+	kind = None if isinstance(output_path, (str, os.PathLike)) else "png"
+	qr.save(output_path, kind=kind, scale=box_size, border=border, dark="black", light="white")
 	return output_path
 
 
+def create_qr_data_uri(url: str, box_size: int = 10, border: int = 4) -> str:
+	"""Generate a QR code for the URL as an inline SVG ``data:`` URI.
+
+	SVG output skips rasterisation and PNG compression entirely, and the URI
+	can be embedded straight into an ``<img src>`` without touching disk.
+
+	Args:
+		url: The URL to encode in the QR.
+		box_size: Size of each QR module in SVG user units.
+		border: Border width (modules).
+
+	Returns:
+		str: A ``data:image/svg+xml`` URI for the QR image.
+	"""
+	qr = _make_qr(url)
+	return qr.svg_data_uri(scale=box_size, border=border, dark="black", light="white")
+
+
 
@@ -0,0 +1,24 @@
+import functools
+import os
+
+import boto3
+from botocore.config import Config
+
+
+@functools.lru_cache(maxsize=1)
+def get_s3():
+    """Return a process-wide S3 client built from the default credential chain.
+
+    The session, service model and connection pool are created on first use
+    and shared afterwards. Adaptive retries and short timeouts keep scripts
+    from hanging on an unreachable endpoint.
+    """
+    session = boto3.session.Session(region_name=os.getenv("AWS_REGION") or None)
+    return session.client(
+        "s3",
+        config=Config(
+            retries={"max_attempts": 3, "mode": "adaptive"},
+            connect_timeout=2,
+            read_timeout=5,
+        ),
+    )
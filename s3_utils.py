@@ -1,18 +1,61 @@
+import logging
 import mimetypes
 import os
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import BinaryIO, Optional, Dict
 from uuid import uuid4
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 
 
-AWS_REGION = (os.getenv("AWS_REGION", "ap-south-1") or "").strip()  # ✅ default to ap-south-1
 AWS_ACCESS_KEY_ID = (os.getenv("AWS_ACCESS_KEY_ID") or "").strip()
 AWS_SECRET_ACCESS_KEY = (os.getenv("AWS_SECRET_ACCESS_KEY") or "").strip()
 AWS_SESSION_TOKEN = (os.getenv("AWS_SESSION_TOKEN") or "").strip()
 
+logger = logging.getLogger(__name__)
+
+# Load the system MIME tables now rather than on the first upload
+mimetypes.init()
+
+# Keep botocore's per-request debug logging from being built at all
+logging.getLogger("boto3").setLevel(logging.WARNING)
+logging.getLogger("botocore").setLevel(logging.WARNING)
+
+# Multipart tuning; hosts with slow disks or links can turn these down
+AWS_S3_MAX_CONCURRENCY = int(os.getenv("AWS_S3_MAX_CONCURRENCY") or min(16, (os.cpu_count() or 4) * 2))
+AWS_S3_PART_SIZE = int(os.getenv("AWS_S3_PART_SIZE") or 16 * 1024 * 1024)
+
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=AWS_S3_PART_SIZE,
+    multipart_chunksize=AWS_S3_PART_SIZE,
+    max_concurrency=AWS_S3_MAX_CONCURRENCY,
+    io_chunksize=1 * 1024 * 1024,
+    use_threads=True,
+)
+
+# upload_fileobj buffers each part of a stream in RAM, so request-body uploads
+# get smaller parts and a hard cap on buffered parts. Per-upload memory is
+# roughly AWS_S3_STREAM_BUFFER_PARTS x AWS_S3_STREAM_PART_SIZE.
+AWS_S3_STREAM_PART_SIZE = int(os.getenv("AWS_S3_STREAM_PART_SIZE") or 8 * 1024 * 1024)
+AWS_S3_STREAM_BUFFER_PARTS = int(os.getenv("AWS_S3_STREAM_BUFFER_PARTS") or min(4, AWS_S3_MAX_CONCURRENCY))
+
+_STREAM_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=AWS_S3_STREAM_PART_SIZE,
+    multipart_chunksize=AWS_S3_STREAM_PART_SIZE,
+    max_concurrency=AWS_S3_STREAM_BUFFER_PARTS,
+    use_threads=True,
+)
+# Not a boto3 TransferConfig argument, but s3transfer reads it (default 10)
+_STREAM_TRANSFER_CFG.max_in_memory_upload_chunks = AWS_S3_STREAM_BUFFER_PARTS
+
+
+def _default_region() -> str:
+    """AWS_REGION read at call time, so a .env loaded after import still applies."""
+    return (os.getenv("AWS_REGION", "ap-south-1") or "").strip() or "ap-south-1"  # ✅ default to ap-south-1
+
 
 def _build_session(region_name: str) -> boto3.session.Session:
     """Create a boto3 Session explicitly from environment credentials and region.
@@ -29,10 +72,30 @@ def _build_session(region_name: str) -> boto3.session.Session:
 
 
 def _get_s3_client(region_name: str = None):
-    """Return an S3 client using SigV4 signing and the specified region."""
-    region = region_name or AWS_REGION
+    """Return an S3 client using SigV4 signing and the specified region.
+
+    Clients are cached per region so presign/upload/delete calls share one
+    warm connection pool instead of rebuilding a session on every request.
+    """
+    # Normalise first so the default and an explicit region share one client
+    return _s3_client_for_region(region_name or _default_region())
+
+
+@lru_cache(maxsize=8)
+def _s3_client_for_region(region: str):
     sess = _build_session(region)
-    return sess.client("s3", config=Config(signature_version="s3v4"))
+    return sess.client(
+        "s3",
+        config=Config(
+            signature_version="s3v4",
+            # Room for every TransferManager worker thread plus regular calls
+            max_pool_connections=max(32, _TRANSFER_CFG.max_concurrency * 2),
+        ),
+    )
+
+
+# Regions that were actually resolved; fallbacks are never stored
+_bucket_regions: Dict[str, str] = {}
 
 
 def _get_bucket_region(bucket: str) -> str:
@@ -40,23 +103,31 @@ def _get_bucket_region(bucket: str) -> str:
 
     If permissions are missing, attempt HeadBucket and read 'x-amz-bucket-region'
     from the error/response headers. Finally, fall back to AWS_REGION.
+
+    Successful lookups are cached per bucket. The AWS_REGION fallback is not,
+    so a transient error does not pin the wrong region for the process.
     """
+    cached = _bucket_regions.get(bucket)
+    if cached:
+        return cached
     try:
-        s3 = _get_s3_client(AWS_REGION)
+        s3 = _get_s3_client()
         resp = s3.get_bucket_location(Bucket=bucket)
         region = resp.get("LocationConstraint") or "us-east-1"
+        _bucket_regions[bucket] = region
         return region
     except ClientError as e:
         # Try HeadBucket to capture region header even on 301/403
         try:
-            s3 = _get_s3_client(AWS_REGION)
+            s3 = _get_s3_client()
             s3.head_bucket(Bucket=bucket)
         except ClientError as he:
             headers = he.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
             region = headers.get("x-amz-bucket-region")
             if region:
+                _bucket_regions[bucket] = region
                 return region
-        return AWS_REGION
+        return _default_region()
 
 
 def _guess_content_type(file_path: str) -> str:
@@ -94,16 +165,57 @@ def upload_to_s3(
         prefix = key_prefix.strip("/")
         object_key = f"{uuid_part}_{basename}" if not prefix else f"{prefix}/{uuid_part}_{basename}"
 
-    content_type = _guess_content_type(file_path)
-    extra = {"ACL": "private", "ContentType": content_type}
+    extra = {"ACL": "private"}
     if extra_args:
         extra.update(extra_args)
+    if "ContentType" not in extra:
+        extra["ContentType"] = _guess_content_type(file_path)
 
     s3.upload_file(
         Filename=file_path,
         Bucket=bucket,
         Key=object_key,
         ExtraArgs=extra,
+        Config=_TRANSFER_CFG,
+    )
+    return object_key
+
+
+def upload_stream_to_s3(
+    fileobj: BinaryIO,
+    bucket: str,
+    object_key: str,
+    extra_args: Optional[Dict[str, str]] = None,
+) -> str:
+    """Stream a readable binary file-like object to S3 with private ACL.
+
+    Bytes are read sequentially from ``fileobj`` and sent as multipart parts,
+    so nothing is staged on local disk first. At most
+    AWS_S3_STREAM_BUFFER_PARTS parts are held in memory at a time.
+
+    Args:
+        fileobj: Binary file-like object open for reading (e.g. an upload stream).
+        bucket: Target S3 bucket.
+        object_key: Object key to write.
+        extra_args: Optional dict of extra S3 args (e.g., ContentType, metadata).
+
+    Returns:
+        str: The S3 object key used.
+    """
+    # Use the bucket's actual region to avoid SignatureDoesNotMatch
+    bucket_region = _get_bucket_region(bucket)
+    s3 = _get_s3_client(bucket_region)
+
+    extra = {"ACL": "private"}
+    if extra_args:
+        extra.update(extra_args)
+
+    s3.upload_fileobj(
+        fileobj,
+        bucket,
+        object_key,
+        ExtraArgs=extra,
+        Config=_STREAM_TRANSFER_CFG,
     )
     return object_key
 
@@ -127,9 +239,9 @@ def generate_presigned_url(
     Returns:
         str: The presigned URL.
     """
-    # Use the bucket's actual region to avoid SignatureDoesNotMatch
-    bucket_region = _get_bucket_region(bucket)
-    s3 = _get_s3_client(bucket_region)
+    # Presigning is a local HMAC; never pay a GetBucketLocation round trip here.
+    # Use the region warm_s3_client (or an upload) resolved, else AWS_REGION.
+    s3 = _get_s3_client(_bucket_regions.get(bucket))
     params = {"Bucket": bucket, "Key": object_key}
     if response_headers:
         params.update(response_headers)
@@ -141,6 +253,29 @@ def generate_presigned_url(
     )
 
 
+def warm_s3_client(bucket: str) -> None:
+    """Resolve the bucket region and open a pooled connection ahead of time.
+
+    Loads endpoint data, builds the SigV4 signer and completes the TLS handshake
+    so the first user request does not pay for them. Failures are ignored; the
+    regular call paths will surface any real configuration problem.
+
+    The resolved region is remembered, so generate_presigned_url signs for the
+    bucket's real region without a lookup of its own.
+    """
+    try:
+        bucket_region = _get_bucket_region(bucket)
+        if bucket_region != _default_region():
+            logger.warning(
+                "Bucket %s is in %s but AWS_REGION is %s; presigning for %s",
+                bucket, bucket_region, _default_region(), bucket_region,
+            )
+        s3 = _get_s3_client(bucket_region)
+        s3.head_bucket(Bucket=bucket)
+    except (BotoCoreError, ClientError):
+        pass
+
+
 def delete_from_s3(bucket: str, object_key: str) -> None:
     """Delete an object from S3."""
     s3 = _get_s3_client()
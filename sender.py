@@ -2,8 +2,8 @@ import argparse
 import os
 import sys
 
-from crypto_utils import encrypt_file
-from qr_utils import create_qr_code
+from crypto_utils import encrypt_file, encrypt_file_parallel
+from qr_utils import QR_FILE_EXTENSIONS, create_qr_code
 from s3_utils import generate_presigned_url, upload_to_s3
 
 
@@ -14,9 +14,13 @@ def main() -> int:
 	parser.add_argument("--key-prefix", default="", help="Optional S3 key prefix (e.g., folder path)")
 	parser.add_argument("--object-key", default=None, help="Explicit S3 object key (overrides generated key)")
 	parser.add_argument("--expires", type=int, default=600, help="Presigned URL expiry in seconds (default: 600)")
-	parser.add_argument("--qr-out", default="qr.png", help="Output path for the QR image (default: qr.png)")
+	parser.add_argument("--qr-out", default="qr.png", help="Output path for the QR image; .png, .svg, .svgz, .pdf or .eps (default: qr.png)")
 	parser.add_argument("--keep-local", action="store_true", help="Keep local encrypted file after upload")
+	parser.add_argument("--parallel", action="store_true", help="Encrypt in independent chunks across all CPUs (large files)")
 	args = parser.parse_args()
+	# Reject an unsupported QR format before spending time on encrypt/upload
+	if not args.qr_out.lower().endswith(QR_FILE_EXTENSIONS):
+		parser.error(f"--qr-out must end with one of: {', '.join(QR_FILE_EXTENSIONS)}")
 
 	plaintext_path = args.file
 	if not os.path.isfile(plaintext_path):
@@ -24,7 +28,8 @@ def main() -> int:
 		return 1
 
 	print("[1/4] Encrypting...")
-	encrypted_path, key_b64 = encrypt_file(plaintext_path)
+	encrypt = encrypt_file_parallel if args.parallel else encrypt_file
+	encrypted_path, key_b64 = encrypt(plaintext_path)
 	print(f"   Encrypted file: {encrypted_path}")
 	print("   AES key (base64) – share out-of-band:")
 	print(key_b64)
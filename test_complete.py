@@ -6,116 +6,144 @@ Tests all components: encryption, S3, QR generation, and Flask app
 
 import os
 import sys
-import tempfile
 import io
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
 from qr_utils import create_qr_code
-from crypto_utils import encrypt_stream_to_file
+from crypto_utils import encrypt_stream_to_sink
 import requests
 
+# Import boto3 once, up front, rather than inside a (possibly threaded) test
+try:
+    from botocore.exceptions import NoCredentialsError, ClientError
+    from s3_client import get_s3
+    _boto_err = None
+except ImportError as e:
+    _boto_err = e
+
+# Per-thread output buffer, so each test's lines print as one block
+_output = threading.local()
+
+def log(*args, **kwargs):
+    """print() into the current test's buffer (stdout outside a test)"""
+    print(*args, file=getattr(_output, "buf", None), **kwargs)
+
+def _run_buffered(test_name, test_func):
+    """Run one test with its log() output captured; return (result, output)"""
+    _output.buf = io.StringIO()
+    try:
+        try:
+            result = test_func()
+        except Exception as e:
+            log(f"❌ {test_name} test crashed: {e}")
+            result = False
+        return result, _output.buf.getvalue()
+    finally:
+        _output.buf = None
+
 def test_encryption():
     """Test encryption functionality"""
-    print("🔐 Testing Encryption...")
+    log("🔐 Testing Encryption...")
     
     # Create a test file
     test_content = b"This is a test file for the secure file transfer system"
     test_stream = io.BytesIO(test_content)
     
-    # Create temporary file for encrypted output
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.enc') as tmp_file:
-        encrypted_path = tmp_file.name
-    
     try:
-        # Encrypt the content
-        encrypted_size, key_b64 = encrypt_stream_to_file(test_stream, encrypted_path)
+        # Encrypt the content into memory; no temp file to create or clean up
+        sink = io.BytesIO()
+        hasher = hashlib.sha256()
+        _, key_b64 = encrypt_stream_to_sink(test_stream, sink, hasher)
+        encrypted_size = sink.tell()
         
-        print(f"✅ Encryption successful")
-        print(f"   - Original size: {len(test_content)} bytes")
-        print(f"   - Encrypted size: {encrypted_size} bytes")
-        print(f"   - Key (base64): {key_b64[:20]}...")
+        # Digest computed while writing must match the bytes that landed
+        if hasher.hexdigest() != hashlib.sha256(sink.getvalue()).hexdigest():
+            log("❌ Ciphertext digest mismatch")
+            return False
         
-        # Clean up
-        os.unlink(encrypted_path)
+        log(f"✅ Encryption successful")
+        log(f"   - Original size: {len(test_content)} bytes")
+        log(f"   - Encrypted size: {encrypted_size} bytes")
+        log(f"   - Key (base64): {key_b64[:20]}...")
+        log(f"   - SHA-256: {hasher.hexdigest()[:16]}...")
         return True
         
     except Exception as e:
-        print(f"❌ Encryption failed: {e}")
+        log(f"❌ Encryption failed: {e}")
         return False
 
 def test_qr_generation():
     """Test QR code generation"""
-    print("\n📱 Testing QR Code Generation...")
+    log("\n📱 Testing QR Code Generation...")
     
     # Test URL (similar to what the app generates)
     test_url = "http://localhost:5000/decrypt?url=https://example.com&key=test_key&fname=test.txt"
     
-    # Generate QR code
-    qr_path = "test_qr.png"
+    # Generate QR code into memory; nothing touches the working directory
+    buf = io.BytesIO()
     try:
-        create_qr_code(test_url, qr_path)
-        print(f"✅ QR code generated successfully: {qr_path}")
+        create_qr_code(test_url, buf)
+        log("✅ QR code generated successfully")
         
-        # Check if file exists and has content
-        if os.path.exists(qr_path) and os.path.getsize(qr_path) > 0:
-            print("✅ QR code file is valid")
+        # Check that the PNG has content
+        if buf.tell() > 0:
+            log("✅ QR code image is valid")
             return True
         else:
-            print("❌ QR code file is empty or missing")
+            log("❌ QR code image is empty")
             return False
             
     except Exception as e:
-        print(f"❌ QR code generation failed: {e}")
+        log(f"❌ QR code generation failed: {e}")
         return False
 
 def test_s3_connection():
     """Test S3 connection if credentials are available"""
-    print("\n☁️ Testing S3 Connection...")
+    log("\n☁️ Testing S3 Connection...")
+    
+    if _boto_err:
+        log("⚠️  boto3 not installed")
+        return False
     
     try:
-        import boto3
-        from botocore.exceptions import NoCredentialsError, ClientError
-        
-        # Try to create S3 client
-        s3 = boto3.client('s3')
-        
         # Try to list buckets (this will fail if no credentials)
-        s3.list_buckets()
-        print("✅ S3 connection successful")
+        get_s3().list_buckets()
+        log("✅ S3 connection successful")
         return True
         
     except NoCredentialsError:
-        print("⚠️  No AWS credentials found (this is OK for local testing)")
+        log("⚠️  No AWS credentials found (this is OK for local testing)")
         return True
     except ClientError as e:
-        print(f"⚠️  S3 connection failed: {e}")
-        return False
-    except ImportError:
-        print("⚠️  boto3 not installed")
+        log(f"⚠️  S3 connection failed: {e}")
         return False
 
 def test_flask_app():
     """Test if Flask app can be imported and configured"""
-    print("\n🌐 Testing Flask App...")
+    log("\n🌐 Testing Flask App...")
     
     try:
         from app import app
         
         # Check if app is configured
         if app.config.get('SECRET_KEY'):
-            print("✅ Flask app configured successfully")
-            print(f"   - Debug mode: {app.debug}")
-            print(f"   - Max content length: {app.config.get('MAX_CONTENT_LENGTH')}")
+            log("✅ Flask app configured successfully")
+            log(f"   - Debug mode: {app.debug}")
+            log(f"   - Max content length: {app.config.get('MAX_CONTENT_LENGTH')}")
             return True
         else:
-            print("❌ Flask app not properly configured")
+            log("❌ Flask app not properly configured")
             return False
             
     except Exception as e:
-        print(f"❌ Flask app test failed: {e}")
+        log(f"❌ Flask app test failed: {e}")
         return False
 
 def test_environment():
     """Test environment variables"""
-    print("\n🔧 Testing Environment...")
+    log("\n🔧 Testing Environment...")
     
     required_vars = ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_REGION', 'AWS_BUCKET']
     optional_vars = ['FLASK_SECRET_KEY', 'DELETE_TOKEN', 'PRESIGN_EXPIRY_SECONDS']
@@ -132,13 +160,13 @@ def test_environment():
             missing_optional.append(var)
     
     if missing_required:
-        print(f"❌ Missing required environment variables: {', '.join(missing_required)}")
+        log(f"❌ Missing required environment variables: {', '.join(missing_required)}")
         return False
     else:
-        print("✅ All required environment variables are set")
+        log("✅ All required environment variables are set")
         
     if missing_optional:
-        print(f"⚠️  Missing optional environment variables: {', '.join(missing_optional)}")
+        log(f"⚠️  Missing optional environment variables: {', '.join(missing_optional)}")
     
     return True
 
@@ -155,14 +183,20 @@ def main():
         ("S3 Connection", test_s3_connection),
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    # Load .env up front so no test depends on another having imported app
+    load_dotenv()
+
+    # Tests touch disjoint resources, so run them side by side; the S3
+    # round trip no longer adds to the local checks' time. Each test's
+    # output is printed whole as soon as it finishes.
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=len(tests)) as ex:
+        futures = {ex.submit(_run_buffered, test_name, test_func): test_name for test_name, test_func in tests}
+        for future in as_completed(futures):
+            test_name = futures[future]
+            outcomes[test_name], output = future.result()
+            sys.stdout.write(output)
+    results = [(test_name, outcomes[test_name]) for test_name, _ in tests]
     
     # Summary
     print("\n" + "=" * 50)
@@ -189,10 +223,6 @@ def main():
         print("   - Set up your .env file with AWS credentials")
         print("   - Ensure all required packages are installed")
         print("   - Check your S3 bucket permissions")
-    
-    # Clean up test files
-    if os.path.exists("test_qr.png"):
-        os.unlink("test_qr.png")
 
 if __name__ == "__main__":
     main()
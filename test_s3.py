@@ -1,30 +1,21 @@
-import boto3
 import os
 from dotenv import load_dotenv
+from s3_client import get_s3
 
 # Load .env file
 load_dotenv()
 
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION")
 AWS_BUCKET = os.getenv("AWS_BUCKET")
 
-# Create boto3 client
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION
-)
+# Shared boto3 client (credentials come from the environment loaded above)
+s3 = get_s3()
 
-# Test file
+# Test object; small enough for a single PutObject (no multipart, no local file)
 file_name = "test.txt"
-with open(file_name, "w") as f:
-    f.write("Hello, Secure File Transfer via QR Code!")
+body = b"Hello, Secure File Transfer via QR Code!"
 
 # Upload file
-s3.upload_file(file_name, AWS_BUCKET, file_name)
+s3.put_object(Bucket=AWS_BUCKET, Key=file_name, Body=body)
 print(f"✅ Uploaded {file_name} to bucket {AWS_BUCKET}")
 
 # Generate presigned URL (valid 60 sec)